@@ -1,21 +1,110 @@
 import argparse
+import functools
 import os
-import json
+import operator
 from typing import Union, Optional, List, Any, AnyStr
 import re
-import parse
+import sys
 import time
+try:
+    import orjson
 
-__VERSION__ = 'v0.0.1'
+    def _json_loads(data: bytes):
+        return orjson.loads(data)
 
+    def _json_dumps(obj: Any):
+        return orjson.dumps(obj, option=orjson.OPT_SORT_KEYS | orjson.OPT_INDENT_2)
+except ImportError:
+    import json
 
-def get_argparser():
-    parser = argparse.ArgumentParser('training task manager - %s' % __VERSION__)
-    parser.add_argument('-d', '--duration', type=int, default=7,
-                        help='show logs within a duration (in days), default: 7 days')
+    def _json_loads(data: bytes):
+        return json.loads(data)
+
+    def _json_dumps(obj: Any):
+        return json.dumps(obj, sort_keys=True, indent=2).encode()
+
+__VERSION__ = 'v0.0.1'
+
+C_MAG = '\033[1;35m'
+C_BLUE = '\033[1;34m'
+C_GREEN = '\033[1;32m'
+C_CYAN = '\033[1;36m'
+C_WHITE = '\033[1;37m'
+C_END = '\033[0m'
+
+
+@functools.lru_cache(maxsize=512)
+def _compile_ci(pattern: AnyStr):
+    return re.compile(pattern, re.IGNORECASE)
+
+
+_FNP_FIELD = re.compile(r'\{\{|\}\}|\{([^{}]*)\}')
+
+
+@functools.lru_cache(maxsize=64)
+def _fnp_to_regex(fnp: AnyStr):
+    # greedy fields anchored at both ends keep the name as long as possible, e.g. {name}.{ext} splits at the last dot
+    parts = []
+    seen = set()
+    pos = 0
+    for m in _FNP_FIELD.finditer(fnp):
+        parts.append(re.escape(fnp[pos:m.start()]))
+        pos = m.end()
+        if m.group(1) is None:
+            parts.append(re.escape(m.group()[0]))
+            continue
+        field = m.group(1).split(':', 1)[0]
+        if field in seen:
+            parts.append('(?P=%s)' % field)
+        elif field.isidentifier():
+            seen.add(field)
+            parts.append('(?P<%s>.+)' % field)
+        else:
+            parts.append('(.+)')
+    parts.append(re.escape(fnp[pos:]))
+    return re.compile(''.join(parts), re.IGNORECASE | re.DOTALL)
+
+
+_BUILTIN_PATTERNS = (
+    r'epoch[^\d]*[\d]+',
+    r'iter[^\d]*[\d]+',
+    r'loss[^\d]*[\d\.]+',
+    r'eta[^\d\w]*(?:[\d\.:]+|[ ,]|days|d|hrs|hours|hour|d|mins|minutes|secs|sec|seconds)+',
+)
+
+
+def _last_match(c: Any, data: Any):
+    m = None
+    for m in c.finditer(data):
+        pass
+    if m is None:
+        return None
+    # mirror re.findall: the whole match without groups, otherwise the group(s)
+    if c.groups == 0:
+        return m.group()
+    if c.groups == 1:
+        return m.group(1) or ''
+    return tuple(g or '' for g in m.groups())
+
+
+def _walk_files(path: AnyStr):
+    try:
+        it = os.scandir(path)
+    except OSError:
+        return
+    with it:
+        for entry in it:
+            try:
+                if entry.is_dir():
+                    if not entry.is_symlink():
+                        yield from _walk_files(entry.path)
+                else:
+                    yield entry
+            except OSError:
+                continue
 
-    subparsers = parser.add_subparsers(help='subcommand help', dest='command')
 
+def _build_add_parser(subparsers):
     op_add_parser = subparsers.add_parser('add', help='add watching group')
     op_add_parser.add_argument('tag', type=str, help='watching group tag')
     op_add_parser.add_argument(
@@ -23,16 +112,22 @@ def get_argparser():
     op_add_parser.add_argument('-p', '--pattern', nargs='+', type=str, default=[],
                                help='patterns to be added to this group')
 
+
+def _build_list_parser(subparsers):
     op_list_parser = subparsers.add_parser('list', help='list watching group info')
     op_list_parser.add_argument('tag', nargs='*', type=str, help='groups to be shown')
     op_list_parser.add_argument('-P', '--path', action='store_true', help='list watching paths')
     op_list_parser.add_argument('-p', '--pattern', action='store_true',
                                 help='list watching patterns')
 
+
+def _build_rm_parser(subparsers):
     op_rm_parser = subparsers.add_parser('rm', help='rm watching groups')
     op_rm_parser.add_argument(
         'tag', nargs='+', type=str, help='groups to be removed (will deactivate these groups if activated, rm a deactivated group will permanently delete it)')
 
+
+def _build_delete_parser(subparsers):
     op_del_parser = subparsers.add_parser(
         'delete', help='delete paths and patterns in a watching group')
     op_del_parser.add_argument('tag', type=str, help='watching group tag')
@@ -41,16 +136,22 @@ def get_argparser():
     op_del_parser.add_argument('-p', '--pattern', nargs='+', type=str, default=[],
                                help='patterns to be deleted from this group')
 
+
+def _build_rename_parser(subparsers):
     op_rename_parser = subparsers.add_parser(
         'rename', help='rename watching group tag')
     op_rename_parser.add_argument('oldtag', type=str, help='watching group tag')
     op_rename_parser.add_argument('newtag', type=str, help='watching group new tag')
 
+
+def _build_arrange_parser(subparsers):
     op_arrange_parser = subparsers.add_parser(
         'arrange', help='arrange the order of patterns in a watching group, please use the index in `list -p`')
     op_arrange_parser.add_argument('tag', type=str, help='watching group tag')
     op_arrange_parser.add_argument('indices', nargs='*', type=int)
 
+
+def _build_config_parser(subparsers):
     op_config_parser = subparsers.add_parser(
         'config', help='config group settings')
     op_config_parser.add_argument('tag', type=str, help='watching group tag')
@@ -71,21 +172,78 @@ def get_argparser():
     op_config_parser.add_argument(
         '-i', '--include', nargs='+', help='include names')
 
+
+def _build_status_parser(subparsers):
     op_status_parser = subparsers.add_parser('status', help='show training status')
     op_status_parser.add_argument('tag', nargs='*', help='groups to show')
     op_status_parser.add_argument('-d', '--duration', type=int, default=7,
                                   help='show logs within a duration (in days), default: 7 days')
 
+
+def _build_inspect_parser(subparsers):
     op_inspect_parser = subparsers.add_parser('inspect', help='inspect details')
     op_inspect_parser.add_argument('tag', type=str, help='groups to show')
     op_inspect_parser.add_argument('name', type=str,
                                    help='show details given the name')
 
+
+_SUBPARSER_BUILDERS = {
+    'add': _build_add_parser,
+    'list': _build_list_parser,
+    'rm': _build_rm_parser,
+    'delete': _build_delete_parser,
+    'rename': _build_rename_parser,
+    'arrange': _build_arrange_parser,
+    'config': _build_config_parser,
+    'status': _build_status_parser,
+    'inspect': _build_inspect_parser,
+}
+
+
+def _peek_command(argv: List[AnyStr]):
+    # only the chosen subcommand is built; help before it needs the full listing
+    for token in argv:
+        if token in ('-h', '--help'):
+            return None
+        if token in _SUBPARSER_BUILDERS:
+            return token
+    return None
+
+
+def get_argparser(argv: Optional[List[AnyStr]] = None):
+    if argv is None:
+        argv = sys.argv[1:]
+    parser = argparse.ArgumentParser('training task manager - %s' % __VERSION__)
+    parser.add_argument('-d', '--duration', type=int, default=7,
+                        help='show logs within a duration (in days), default: 7 days')
+
+    subparsers = parser.add_subparsers(help='subcommand help', dest='command')
+
+    command = _peek_command(argv)
+    if command is not None:
+        _SUBPARSER_BUILDERS[command](subparsers)
+    else:
+        for build in _SUBPARSER_BUILDERS.values():
+            build(subparsers)
+
     return parser
 
 
 class TaskManager(object):
 
+    # subcommand -> (handler name, whether to print its result); no subcommand shows status
+    _DISPATCH = {
+        'add': ('add_group_by_args', False),
+        'list': ('list_group_by_args', True),
+        'rm': ('rm_group_by_args', False),
+        'delete': ('del_group_by_args', False),
+        'rename': ('mv_group_by_args', False),
+        'arrange': ('arrange_group_by_args', False),
+        'config': ('config_group_by_args', False),
+        'inspect': ('inspect_group_by_args', True),
+        'status': ('render_by_args', True),
+    }
+
     @staticmethod
     def _ensure_sequential(data: Any):
         if not isinstance(data, (list, tuple)):
@@ -115,8 +273,8 @@ class TaskManager(object):
 
     @staticmethod
     def save_cfg(path: AnyStr, data: Any):
-        with open(path, 'w') as fd:
-            json.dump(data, fd, sort_keys=True, indent=2)
+        with open(path, 'wb') as fd:
+            fd.write(_json_dumps(data))
 
     @staticmethod
     def load_cfg(path: AnyStr, create_if_not_exists: bool = True):
@@ -125,8 +283,8 @@ class TaskManager(object):
                 TaskManager.save_cfg(path, TaskManager.init_config())
             else:
                 raise FileNotFoundError(path)
-        with open(path) as fd:
-            data = json.load(fd)
+        with open(path, 'rb') as fd:
+            data = _json_loads(fd.read())
         ret = TaskManager.init_config()
         ret.update(data)
         for group_type in ['activated_groups', 'deactivated_groups']:
@@ -140,9 +298,27 @@ class TaskManager(object):
         self.cfg_path = os.path.abspath(os.path.expanduser(cfg_path))
         self.cfg = self.load_cfg(self.cfg_path, create_if_not_exists=create_if_not_exists)
         self.width = width
+        self._dirty = False
+        self._batch_depth = 0
 
     def save(self):
         self.save_cfg(self.cfg_path, self.cfg)
+        self._dirty = False
+
+    def _changed(self):
+        self._dirty = True
+        if not self._batch_depth:
+            self.save()
+
+    def __enter__(self):
+        self._batch_depth += 1
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self._batch_depth -= 1
+        if not self._batch_depth and self._dirty:
+            self.save()
+        return False
 
     def __getitem__(self, tag: AnyStr):
         if tag not in self.cfg['activated_groups']:
@@ -163,60 +339,52 @@ class TaskManager(object):
         if remove_all_patterns:
             item['patterns'] = []
         if exclude is not None:
-            item['excluded'].extend(exclude)
-            item['excluded'] = list(set(item['excluded']))
-            item['included'] = list(set(item['included']) - set(item['excluded']))
+            item['excluded'] = list(dict.fromkeys(item['excluded'] + list(exclude)))
+            excl_set = set(item['excluded'])
+            item['included'] = [x for x in item['included'] if x not in excl_set]
         if include is not None:
-            item['included'].extend(include)
-            item['included'] = list(set(item['included']))
-            item['excluded'] = list(set(item['excluded']) - set(item['included']))
-        self.save()
+            item['included'] = list(dict.fromkeys(item['included'] + list(include)))
+            incl_set = set(item['included'])
+            item['excluded'] = [x for x in item['excluded'] if x not in incl_set]
+        self._changed()
 
     def activate(self, tags: Union[AnyStr, List[AnyStr]]):
         tags = self._ensure_sequential(tags)
         for tag in tags:
-            if tag in self.cfg['deactivated_groups']:
-                if tag not in self.cfg['activated_groups']:
-                    v = self.cfg['deactivated_groups'][tag]
-                    self.cfg['activated_groups'][tag] = v
-                del self.cfg['deactivated_groups'][tag]
-            if tag not in self.cfg['activated_groups']:
+            v = self.cfg['deactivated_groups'].pop(tag, None)
+            if v is not None:
+                self.cfg['activated_groups'].setdefault(tag, v)
+            elif tag not in self.cfg['activated_groups']:
                 self.cfg['activated_groups'][tag] = self.default_group()
-        self.save()
+        self._changed()
 
     def deactivate(self, tags: Union[AnyStr, List[AnyStr]]):
         tags = self._ensure_sequential(tags)
         for tag in tags:
-            if tag in self.cfg['activated_groups']:
-                v = self.cfg['activated_groups'][tag]
+            v = self.cfg['activated_groups'].pop(tag, None)
+            if v is not None:
                 self.cfg['deactivated_groups'][tag] = v
-                del self.cfg['activated_groups'][tag]
-            elif tag in self.cfg['deactivated_groups']:
-                del self.cfg['deactivated_groups'][tag]
-        self.save()
+            else:
+                self.cfg['deactivated_groups'].pop(tag, None)
+        self._changed()
 
     def add_paths(self, tag: AnyStr, paths: Union[AnyStr, List[AnyStr]]):
         item = self[tag]
         paths = list(map(lambda x: os.path.abspath(x), self._ensure_sequential(paths)))
         item['paths'].extend(paths)
-        self.save()
+        self._changed()
 
     def del_paths(self, tag: AnyStr, paths: Union[AnyStr, List[AnyStr]]):
         item = self[tag]
         paths = set(map(lambda x: os.path.abspath(x),  self._ensure_sequential(paths)))
-        new_paths = []
-        for path in item['paths']:
-            abspath = os.path.abspath(path)
-            if abspath not in paths:
-                new_paths.append(path)
-        item['paths'] = new_paths
-        self.save()
+        item['paths'] = [path for path in item['paths'] if path not in paths]
+        self._changed()
 
     def add_patterns(self, tag: AnyStr, patterns: Union[AnyStr, List[AnyStr]]):
         item = self[tag]
         patterns = self._ensure_sequential(patterns)
         item['patterns'].extend(patterns)
-        self.save()
+        self._changed()
 
     def del_patterns(self, tag: AnyStr, patterns: Union[AnyStr, List[AnyStr]]):
         item = self[tag]
@@ -233,7 +401,7 @@ class TaskManager(object):
             if i not in rm_set and pattern not in p_set:
                 new_patterns.append(pattern)
         item['patterns'] = new_patterns
-        self.save()
+        self._changed()
 
     def arrange(self, tag: AnyStr, indices: List[int]):
         item = self[tag]
@@ -246,7 +414,7 @@ class TaskManager(object):
                 raise IndexError(str(indices))
         new_patterns = [item['patterns'][int(i)] for i in indices]
         item['patterns'] = new_patterns
-        self.save()
+        self._changed()
 
     def edit_patterns(self, tag: AnyStr, index: Union[str, int], p: AnyStr):
         item = self[tag]
@@ -261,7 +429,7 @@ class TaskManager(object):
         if not (index >= 0 and index < len(item['patterns'])):
             raise IndexError(str(index))
         item['patterns'][index] = p
-        self.save()
+        self._changed()
 
     def mv(self, oldtag: AnyStr, newtag: AnyStr):
         if newtag in self.cfg['activated_groups']:
@@ -270,28 +438,28 @@ class TaskManager(object):
             raise KeyError(oldtag)
         self.cfg['activated_groups'][newtag] = self.cfg['activated_groups'][oldtag]
         del self.cfg['activated_groups'][oldtag]
-        self.save()
+        self._changed()
 
     def group_config_view(self, group_type: AnyStr, tags: List[AnyStr], showPath: bool = False, showPattern: bool = False):
         t_set = set(tags)
         ret_str = []
+        cwd = os.getcwd()
         for tag in sorted(self.cfg[group_type].keys()):
             if not t_set or tag in t_set:
                 item = self.cfg[group_type][tag]
-                tmp_str = '\033[1;35m[{}]\033[0m `{}`: {} paths {} patterns'.format(
-                    tag, item['fnp'], len(item['paths']), len(item['patterns']))
+                tmp_str = '%s[%s]%s `%s`: %d paths %d patterns' % (
+                    C_MAG, tag, C_END, item['fnp'], len(item['paths']), len(item['patterns']))
                 if item['builtin_func']:
                     tmp_str += '*'
                 ret_str.append(tmp_str)
                 if showPath:
                     ret_str.append('  paths:')
                     for p in item['paths']:
-                        p = os.path.relpath(p, os.getcwd())
-                        ret_str.append('    \033[1;34m'+p+'\033[0m')
+                        ret_str.append('    ' + C_BLUE + os.path.relpath(p, cwd) + C_END)
                 if showPattern:
                     ret_str.append('  patterns:')
                     for i, p in enumerate(item['patterns']):
-                        ret_str.append('   \033[1;32m[{}]\033[0m \033[1;34m{}\033[0m'.format(i, p))
+                        ret_str.append('   %s[%d]%s %s%s%s' % (C_GREEN, i, C_END, C_BLUE, p, C_END))
         return ret_str
 
     def render_config_view(self, tags: List[AnyStr], **kwargs):
@@ -313,20 +481,16 @@ class TaskManager(object):
         return '\n'.join(ret_str)
 
     @staticmethod
-    def match_file(fnp: AnyStr, fn: AnyStr):
-        # fnp_re = re.sub(r'\{#name\}', r'[^/\\\]+', fnp) + '$'
-        # fnp_re = re.sub(r'\{#digit\}', r'[\\d]+', fnp_re)
-        # fnp_re = re.sub(r'\{#char\}', r'[\\w]+', fnp_re)
-        # fnp_re = re.sub(r'\{#mix\}', r'[\\w\\d]+', fnp_re)
-        # fnp_re = re.sub(r'\{#any\}', r'[^/\\\]+', fnp_re)
-        # fnp_re = re.sub(r'\.', r'\.', fnp_re)
-        # c = re.compile(fnp_re)
-        # f = c.findall(fn)
-        fn_reversed = fn[::-1]
-        fnp_reversed = fnp[::-1].replace('{', '!|*#').replace('}', '{').replace('!|*#', '}')
-        res = parse.parse(fnp_reversed, fn_reversed)
+    def compile_fnp(fnp: AnyStr):
+        return _fnp_to_regex(fnp)
+
+    @staticmethod
+    def match_file(fnp: Union[AnyStr, Any], fn: AnyStr):
+        if isinstance(fnp, str):
+            fnp = TaskManager.compile_fnp(fnp)
+        res = fnp.fullmatch(fn)
         if res:
-            return True, res['eman'][::-1]
+            return True, res.group('name')
         else:
             return False, None
 
@@ -334,88 +498,73 @@ class TaskManager(object):
         recs = {}
         item = self[tag]
         logs = {}
+        compiled_fnp = self.compile_fnp(item['fnp'])
         for path in item['paths']:
-            for dn, _, fns in os.walk(path):
-                for fn in fns:
-                    fullfn = os.path.join(dn, fn)
-                    ok, matched_name = self.match_file(item['fnp'], fullfn)
-                    if ok:
-                        logs.setdefault(matched_name, []).append(fullfn)
+            for entry in _walk_files(path):
+                ok, matched_name = self.match_file(compiled_fnp, entry.path)
+                if ok and (inspect is None or matched_name == inspect):
+                    try:
+                        mtime = entry.stat().st_mtime
+                    except OSError:
+                        continue
+                    logs.setdefault(matched_name, []).append((mtime, entry.path))
+        # ending detection must be the first pattern
+        patterns = [item['ending']]
+        compiled = [_compile_ci(item['ending'])]
+        if item['builtin_func']:
+            patterns.extend(_BUILTIN_PATTERNS)
+            compiled.extend(_compile_ci(p) for p in _BUILTIN_PATTERNS)
+        patterns.extend(item['patterns'])
+        compiled.extend(_compile_ci(p) for p in item['patterns'])
         include_set = set(item['included'])
         exclude_set = set(item['excluded'])
         for one in sorted(logs.keys()):
-            fns = sorted(logs[one], key=lambda x: os.path.getmtime(x), reverse=True)
-            stamp = os.path.getmtime(fns[0])
+            fns = sorted(logs[one], key=operator.itemgetter(0), reverse=True)
+            stamp = fns[0][0]
+            fns = [fn for _, fn in fns]
             delta = int(time.time() - stamp)
-            if inspect is None and (isinstance(duration, (int, float)) and delta > duration and one not in include_set or one in exclude_set) \
-                    or inspect is not None and one != inspect:
+            if inspect is None and (isinstance(duration, (int, float)) and delta > duration and one not in include_set or one in exclude_set):
                 continue
-            patterns = list(item['patterns'])
-            if item['builtin_func']:
-                patterns.insert(
-                    0, r'eta[^\d\w]*(?:[\d\.:]+|[ ,]|days|d|hrs|hours|hour|d|mins|minutes|secs|sec|seconds)+')
-                patterns.insert(0, r'loss[^\d]*[\d\.]+')
-                patterns.insert(0, r'iter[^\d]*[\d]+')
-                patterns.insert(0, r'epoch[^\d]*[\d]+')
-            patterns.insert(0, item['ending'])  # ending detection must be the first pattern
             found = {}
+            ended = False
             ptr = -1
-            remain = len(patterns)
-            while remain > 0 and ptr + 1 < len(fns):
+            todo = list(range(1, len(patterns)))
+            while ptr + 1 < len(fns) and (ptr < 0 or todo):
                 ptr += 1
                 fn = fns[ptr]
                 with open(fn) as fd:
                     text = fd.read()
-                tmp = {}
-                for i, pattern in enumerate(patterns):
-                    if pattern not in found:
-                        c = re.compile(pattern, re.IGNORECASE)
-                        results = c.findall(text)
-                        if results:
-                            if i == 0:
-                                tmp[pattern] = ptr
-                            else:
-                                tmp[pattern] = results[-1]
-                            remain -= 1
-                found.update(tmp)
-            flag = None
+                if ptr == 0:
+                    # only an ending in the newest log counts, so it is settled after the first file
+                    ended = compiled[0].search(text) is not None
+                for i in todo:
+                    result = _last_match(compiled[i], text)
+                    if result is not None:
+                        found[patterns[i]] = result
+                todo = [i for i in todo if patterns[i] not in found]
+            flag = 1 if ended else 0
             item_str = []
-            for i, pattern in enumerate(patterns):
-                if i == 0:
-                    if pattern in found and found[pattern] == 0:
-                        flag = 1
+            for pattern in patterns[1:]:
+                if pattern in found:
+                    if not item_str:
+                        item_str.append(' ' + found[pattern])
                     else:
-                        flag = 0
-                else:
-                    if pattern in found:
-                        if not item_str:
-                            item_str.append(' ' + found[pattern])
+                        if width is None or len(item_str[-1]) + len(found[pattern]) + 3 <= width:
+                            item_str[-1] += ' | ' + found[pattern]
                         else:
-                            if width is None or len(item_str[-1]) + len(found[pattern]) + 3 <= width:
-                                item_str[-1] += ' | ' + found[pattern]
-                            else:
-                                item_str.append(' ' + found[pattern])
+                            item_str.append(' ' + found[pattern])
             for tp, line in enumerate(item_str):
                 if tp & 1:
-                    item_str[tp] = '\033[1;37m' + line
-                item_str[tp] += '\033[0m'
+                    item_str[tp] = C_WHITE + line
+                item_str[tp] += C_END
             if inspect is not None:
                 item_str.append(' ' + '---' * 3)
                 item_str.extend(map(lambda x: ' * ' + x, fns))
-            d = delta // 86400
-            h = (delta - d * 86400) // 3600
-            m = (delta - d * 86400 - h * 3600) // 60
-            s = (delta - d * 86400 - h * 3600 - m * 60) // 1
-            d_str = ''
-            if d > 0:
-                d_str += '{} days '.format(d)
-            if h > 0:
-                d_str += '{} hrs '.format(h)
-            if m > 0:
-                d_str += '{} mins '.format(m)
-            if s > 0:
-                d_str += '{} secs '.format(s)
-            tmp = ['\033[1;36m[{}]\033[0m \033[1;34m{}ago\033[0m'.format(one, d_str)] + item_str
+            d, rem = divmod(delta, 86400)
+            h, rem = divmod(rem, 3600)
+            m, s = divmod(rem, 60)
+            d_str = ''.join('{} {} '.format(v, unit) for v, unit in ((d, 'days'), (h, 'hrs'), (m, 'mins'), (s, 'secs')) if v > 0)
+            tmp = ['%s[%s]%s %s%sago%s' % (C_CYAN, one, C_END, C_BLUE, d_str, C_END)] + item_str
             recs.setdefault(flag, []).append(tmp)
         ret_flags = sorted(list(recs.keys()))
         ret_strs = [recs[i] for i in ret_flags]
@@ -428,7 +577,7 @@ class TaskManager(object):
             for group_view in ret_str_ongoing:
                 tag, group_view = group_view
                 if group_view:
-                    ret_str.append(' \033[1;35m[{}]\033[0m'.format(tag))
+                    ret_str.append(' %s[%s]%s' % (C_MAG, tag, C_END))
                     for group_line in group_view:
                         for line in group_line:
                             ret_str.append('  ' + line)
@@ -437,7 +586,7 @@ class TaskManager(object):
             for group_view in ret_str_ended:
                 tag, group_view = group_view
                 if group_view:
-                    ret_str.append(' \033[1;35m[{}]\033[0m'.format(tag))
+                    ret_str.append(' %s[%s]%s' % (C_MAG, tag, C_END))
                     for group_line in group_view:
                         for line in group_line:
                             ret_str.append('  ' + line)
@@ -459,15 +608,21 @@ class TaskManager(object):
         ret_str_ongoing = []
         ret_str_ended = []
         t_set = set(tags)
-        for tag in sorted(self.cfg['activated_groups'].keys()):
-            if not t_set or tag in t_set:
-                end_flags, view_strs = self.group_panel_view(
-                    tag, duration=duration, width=self.width)
-                for end_flag, view_str in zip(end_flags, view_strs):
-                    if end_flag:
-                        ret_str_ended.append((tag, view_str))
-                    else:
-                        ret_str_ongoing.append((tag, view_str))
+        tags_to_scan = [tag for tag in sorted(self.cfg['activated_groups'].keys()) if not t_set or tag in t_set]
+        if len(tags_to_scan) > 1:
+            # only directory walks and file reads overlap; regex matching still holds the GIL
+            from concurrent.futures import ThreadPoolExecutor
+            with ThreadPoolExecutor(max_workers=min(8, len(tags_to_scan))) as ex:
+                results = list(ex.map(lambda t: (t, self.group_panel_view(
+                    t, duration=duration, width=self.width)), tags_to_scan))
+        else:
+            results = [(t, self.group_panel_view(t, duration=duration, width=self.width)) for t in tags_to_scan]
+        for tag, (end_flags, view_strs) in results:
+            for end_flag, view_str in zip(end_flags, view_strs):
+                if end_flag:
+                    ret_str_ended.append((tag, view_str))
+                else:
+                    ret_str_ongoing.append((tag, view_str))
         ret_str = self.get_section_view(ret_str_ongoing, ret_str_ended)
         return '\n'.join(ret_str)
 
@@ -506,27 +661,11 @@ class TaskManager(object):
         return self.render_panel_view(args.tag if hasattr(args, 'tag') else [], duration=args.duration * 86400)
 
     def process(self, args: Any):
-        if args.command == 'add':
-            self.add_group_by_args(args)
-        if args.command == 'list':
-            view_str = self.list_group_by_args(args)
-            print(view_str)
-        if args.command == 'rm':
-            self.rm_group_by_args(args)
-        if args.command == 'delete':
-            self.del_group_by_args(args)
-        if args.command == 'rename':
-            self.mv_group_by_args(args)
-        if args.command == 'arrange':
-            self.arrange_group_by_args(args)
-        if args.command == 'config':
-            self.config_group_by_args(args)
-        if args.command == 'inspect':
-            view_str = self.inspect_group_by_args(args)
-            print(view_str)
-        if args.command == 'status' or args.command is None:
-            view_str = self.render_by_args(args)
-            print(view_str)
+        with self:
+            name, do_print = self._DISPATCH.get(args.command, ('render_by_args', True))
+            res = getattr(self, name)(args)
+            if do_print:
+                print(res)
 
 
 def main(args):